@@ -47,3 +47,12 @@ flags.DEFINE_string(
 
 flags.DEFINE_string(
     'oci_profile', None, 'Default profile to be used')
+
+flags.DEFINE_boolean(
+    'oci_use_sdk', False, 'Manage networking through the OCI Python SDK '
+    'instead of the oci CLI. Requires the "oci" package.')
+
+flags.DEFINE_string(
+    'oci_compartment_id', None, 'Compartment to create resources in when '
+    'using the OCI Python SDK. Defaults to the compartment-id of the profile '
+    'in ~/.oci/oci_cli_rc.')
@@ -14,41 +14,364 @@
 
 """Module containing classes related to Oracle Network."""
 
+import functools
 import json
 import logging
+import os
+import random
+import time
+from typing import Final
 import uuid
 
 from absl import flags
+from perfkitbenchmarker import background_tasks
+from perfkitbenchmarker import errors
 from perfkitbenchmarker import network
 from ampere.pkb import provider_info
 from perfkitbenchmarker import resource
 from perfkitbenchmarker import vm_util
 from ampere.pkb.providers.oci import util
 
+try:
+    import oci
+except ImportError:
+    oci = None
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 FLAGS = flags.FLAGS
 
 MAX_NAME_LENGTH = 128
+MAX_DNS_LABEL_LENGTH = 15
 WAIT_INTERVAL_SECONDS = 600
 
-VCN_CREATE_STATUSES = frozenset(
-    ["AVAILABLE", "PROVISIONING", "TERMINATED", "TERMINATING", "UPDATING"]
+# Makes CLI deletes block until the resource is gone. Subnet and internet
+# gateway deletes are otherwise asynchronous, and a VCN can only be deleted
+# once they are gone.
+_CLI_DELETE_WAIT_ARGS: Final = (
+    "--wait-for-state",
+    "TERMINATED",
+    "--max-wait-seconds",
+    str(WAIT_INTERVAL_SECONDS),
 )
 
-SUBNET_CREATE_STATUSES = frozenset(
-    ["AVAILABLE", "PROVISIONING", "TERMINATED", "TERMINATING", "UPDATING"]
+# Lifecycle states shared by all OCI networking resources. Only VCNs and
+# subnets additionally have an UPDATING state.
+_LIFECYCLE_STATES: Final = frozenset(
+    {"AVAILABLE", "PROVISIONING", "TERMINATED", "TERMINATING"}
 )
+_UPDATABLE_LIFECYCLE_STATES: Final = _LIFECYCLE_STATES | {"UPDATING"}
 
-IG_CREATE_STATUSES = frozenset(
-    ["AVAILABLE", "PROVISIONING", "TERMINATED", "TERMINATING"]
-)
+VCN_CREATE_STATUSES: Final = _UPDATABLE_LIFECYCLE_STATES
+SUBNET_CREATE_STATUSES: Final = _UPDATABLE_LIFECYCLE_STATES
+IG_CREATE_STATUSES: Final = _LIFECYCLE_STATES
+ROUTE_TABLE_UPDATE_STATUSES: Final = _LIFECYCLE_STATES
+SECURITY_LIST_UPDATE_STATUSES: Final = _LIFECYCLE_STATES
 
-ROUTE_TABLE_UPDATE_STATUSES = frozenset(
-    ["AVAILABLE", "PROVISIONING", "TERMINATED", "TERMINATING"]
-)
+# States a resource never leaves, so waiting for any other state is pointless.
+_TERMINAL_STATES: Final = frozenset({"FAILED", "TERMINATED"})
+
+# Statuses after which an OCI work request makes no further progress.
+_WORK_REQUEST_FINAL_STATUSES: Final = frozenset({"SUCCEEDED", "FAILED", "CANCELED"})
 
-SECURITY_LIST_UPDATE_STATUSES = frozenset(
-    ["AVAILABLE", "PROVISIONING", "TERMINATED", "TERMINATING"]
+# Transient failures OciNetwork.Create is retried on: failed CLI or SDK calls,
+# unparsable CLI output and timed out waits. errors.Resource.CreationError,
+# raised for terminal states, is deliberately not retried.
+_RETRYABLE_CREATE_ERRORS = (
+    errors.VmUtil.IssueCommandError,
+    errors.VmUtil.ThreadException,
+    vm_util.TimeoutExceededRetryError,
+    IndexError,
+    KeyError,
+    ValueError,
 )
+if oci:
+    _RETRYABLE_CREATE_ERRORS += (
+        oci.exceptions.ServiceError,
+        oci.exceptions.RequestException,
+    )
+
+
+def _JsonLoads(data):
+    """Parses OCI CLI JSON output (str or bytes), using orjson if installed."""
+    if orjson:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def _JsonDumps(obj):
+    """Serializes an OCI CLI JSON argument, using orjson when it is installed."""
+    if orjson:
+        return orjson.dumps(obj).decode()
+    return json.dumps(obj)
+
+
+def _RaiseIfTerminalState(check_state, status_list):
+    """Raises if a resource is stuck in a state other than the awaited ones."""
+    if check_state in _TERMINAL_STATES and check_state not in status_list:
+        raise errors.Resource.CreationError(
+            "Resource reached terminal lifecycle-state %s while waiting for %s"
+            % (check_state, status_list)
+        )
+
+
+def _PollUntilState(
+    cmd, status_list, initial=2, max_interval=30, timeout=WAIT_INTERVAL_SECONDS
+):
+    """Polls an OCI get command until its lifecycle-state is in status_list.
+
+    Polls back off exponentially from initial up to max_interval seconds, with
+    up to a second of jitter, so fast transitions are observed promptly.
+
+    Args:
+      cmd: The OCI CLI get command to issue, as an argv list.
+      status_list: The lifecycle states to wait for.
+      initial: The first sleep interval in seconds.
+      max_interval: The maximum sleep interval in seconds.
+      timeout: The maximum time to wait in seconds.
+
+    Returns:
+      The "data" dict of the last get response, whose lifecycle-state is in
+      status_list.
+
+    Raises:
+      errors.Resource.CreationError: If the resource reaches a terminal state
+        that is not in status_list.
+      vm_util.TimeoutExceededRetryError: If the state is not reached in time.
+    """
+    deadline = time.time() + timeout
+    attempt = 0
+    check_state = None
+    while True:
+        out, stderr, retcode = vm_util.IssueCommand(cmd, raise_on_failure=False)
+        if retcode:
+            # Transient CLI failures are treated like a missed state.
+            logging.info("Retrying failed lifecycle-state poll: %s", stderr)
+        else:
+            data = _JsonLoads(out)["data"]
+            check_state = data["lifecycle-state"]
+            if check_state in status_list:
+                return data
+            _RaiseIfTerminalState(check_state, status_list)
+        sleep_time = min(max_interval, initial * 2**attempt) + random.uniform(0, 1)
+        if time.time() + sleep_time >= deadline:
+            raise vm_util.TimeoutExceededRetryError(
+                "Timed out waiting for lifecycle-state in %s, last state was %s"
+                % (status_list, check_state)
+            )
+        time.sleep(sleep_time)
+        attempt += 1
+
+
+def _RunParallelWaits(target_arg_tuples):
+    """Runs waits concurrently, re-raising a CreationError from any of them.
+
+    RunParallelThreads reports failures as errors.VmUtil.ThreadException,
+    which is retryable, so terminal-state errors are returned from each thread
+    and raised again here.
+
+    Args:
+      target_arg_tuples: list of (target, args) tuples.
+
+    Raises:
+      errors.Resource.CreationError: If any of the waits raised one.
+    """
+
+    def _Wait(target, args):
+        try:
+            target(*args)
+        except errors.Resource.CreationError as e:
+            return e
+
+    results = background_tasks.RunParallelThreads(
+        [(_Wait, [target, args], {}) for target, args in target_arg_tuples],
+        max_concurrency=len(target_arg_tuples),
+    )
+    for result in results:
+        if result:
+            raise result
+
+
+def _GetSdkClientKwargs(profile):
+    """Returns the config and signer arguments for OCI SDK clients."""
+    if oci is None:
+        raise ImportError(
+            'The "oci" package is required to use --oci_use_sdk. Please make '
+            "sure it is installed."
+        )
+    config = oci.config.from_file(profile_name=profile)
+    kwargs = {"config": config}
+    if "security_token_file" in config:
+        # Profiles set up with `oci session authenticate` sign with a token.
+        with open(os.path.expanduser(config["security_token_file"])) as f:
+            token = f.read()
+        private_key = oci.signer.load_private_key_from_file(config["key_file"])
+        kwargs["signer"] = oci.auth.signers.SecurityTokenSigner(token, private_key)
+    return kwargs
+
+
+def _GetVirtualNetworkClient(client_kwargs):
+    """Returns an OCI SDK VirtualNetworkClient built from _GetSdkClientKwargs."""
+    return oci.core.VirtualNetworkClient(**client_kwargs)
+
+
+def _GetWorkRequestClient(client_kwargs):
+    """Returns an OCI SDK WorkRequestClient built from _GetSdkClientKwargs."""
+    return oci.work_requests.WorkRequestClient(**client_kwargs)
+
+
+def _WaitForWorkRequest(client, work_request_id):
+    """Waits until an OCI work request has finished.
+
+    Args:
+      client: The OCI SDK WorkRequestClient.
+      work_request_id: The opc-work-request-id returned by a create call.
+
+    Raises:
+      errors.Resource.CreationError: If the work request did not succeed.
+    """
+    response = oci.wait_until(
+        client,
+        client.get_work_request(work_request_id),
+        evaluate_response=lambda r: r.data.status in _WORK_REQUEST_FINAL_STATUSES,
+        max_interval_seconds=2,
+        max_wait_seconds=WAIT_INTERVAL_SECONDS,
+    )
+    if response.data.status != "SUCCEEDED":
+        raise errors.Resource.CreationError(
+            "Work request %s finished with status %s"
+            % (work_request_id, response.data.status)
+        )
+
+
+def _WaitForSdkState(client, response, status_list):
+    """Waits until the lifecycle_state of an SDK response is in status_list.
+
+    Args:
+      client: The OCI SDK client that issued the response.
+      response: The response of a get call for the resource to wait on.
+      status_list: The lifecycle states to wait for.
+
+    Returns:
+      The data of the last get response, whose lifecycle_state is in
+      status_list.
+
+    Raises:
+      errors.Resource.CreationError: If the resource reaches a terminal state
+        that is not in status_list.
+    """
+    response = oci.wait_until(
+        client,
+        response,
+        evaluate_response=lambda r: (
+            r.data.lifecycle_state in status_list
+            or r.data.lifecycle_state in _TERMINAL_STATES
+        ),
+        max_interval_seconds=5,
+        max_wait_seconds=WAIT_INTERVAL_SECONDS,
+    )
+    _RaiseIfTerminalState(response.data.lifecycle_state, status_list)
+    return response.data
+
+
+def _VcnDetailsFromSdk(vcn):
+    """Converts an SDK Vcn into the CLI's `vcn get` data layout."""
+    return {
+        "cidr-block": vcn.cidr_block,
+        "default-route-table-id": vcn.default_route_table_id,
+        "default-security-list-id": vcn.default_security_list_id,
+        "lifecycle-state": vcn.lifecycle_state,
+    }
+
+
+def _WaitForSdkDeletion(client, get, resource_id):
+    """Waits until an SDK resource is TERMINATED or no longer exists.
+
+    Subnet and internet gateway deletes are asynchronous, and a VCN can only
+    be deleted once they are gone.
+
+    Args:
+      client: The OCI SDK client that issued the delete.
+      get: The client's get method for the resource, e.g. client.get_subnet.
+      resource_id: The OCID of the deleted resource.
+    """
+    try:
+        response = get(resource_id)
+    except oci.exceptions.ServiceError as e:
+        if e.status == 404:
+            return
+        raise
+    oci.wait_until(
+        client,
+        response,
+        "lifecycle_state",
+        "TERMINATED",
+        max_interval_seconds=5,
+        max_wait_seconds=WAIT_INTERVAL_SECONDS,
+        succeed_on_not_found=True,
+    )
+
+
+def _IngressRuleToSdk(rule):
+    """Converts an ingress rule dict into an SDK IngressSecurityRule."""
+    models = oci.core.models
+    tcp_options = None
+    if rule["tcp-options"]:
+        port_range = rule["tcp-options"]["destinationPortRange"]
+        tcp_options = models.TcpOptions(
+            destination_port_range=models.PortRange(
+                min=port_range["min"], max=port_range["max"]
+            )
+        )
+    icmp_options = None
+    if rule["icmp-options"]:
+        icmp_options = models.IcmpOptions(
+            type=rule["icmp-options"]["type"], code=rule["icmp-options"]["code"]
+        )
+    return models.IngressSecurityRule(
+        source=rule["source"],
+        protocol=rule["protocol"],
+        is_stateless=rule["is-stateless"],
+        tcp_options=tcp_options,
+        icmp_options=icmp_options,
+    )
+
+
+def _MakeIngressRule(
+    protocol="6",
+    start_port=22,
+    end_port=None,
+    source_range=None,
+    protocol_type=None,
+    protocol_code=None,
+):
+    """Builds a security list ingress rule dict for the OCI CLI."""
+    end_port = end_port or start_port
+    source_range = source_range or "0.0.0.0/0"
+    # tcp =6 #udp=17
+
+    logging.info(f"Add ingress rule for ports {start_port} : {end_port}")
+    icmp_options = None
+    tcp_options = None
+    if protocol == "1":
+        if protocol_type is not None or protocol_code is not None:
+            icmp_options = {"code": protocol_code, "type": protocol_type}
+    elif start_port:
+        tcp_options = {
+            "destinationPortRange": {"max": int(end_port), "min": int(start_port)}
+        }
+
+    return {
+        "source": source_range,
+        "icmp-options": icmp_options,
+        "protocol": protocol,
+        "is-stateless": False,
+        "tcp-options": tcp_options,
+        "udp-options": None,
+    }
 
 
 class OciVcn(resource.BaseResource):
@@ -66,252 +389,480 @@ class OciVcn(resource.BaseResource):
         self.vcn_id = None
         self.subnet_id = None
         self.ig_id = None
-        self.rt_id = None
-        self.security_list_id = None
-        self.tags = util.MakeFormattedDefaultTags()
+        # Results of `vcn get`, keyed by vcn_id.
+        self._vcn_details = {}
+        self.tags = {
+            k: v for k, v in sorted(util.GetDefaultTags().items()) if k != "owner"
+        }
+        self._display_name = f"pkb-{FLAGS.run_uri}"[:MAX_NAME_LENGTH]
+        self._vcn_dns_label = f"vcn{FLAGS.run_uri}"[:MAX_DNS_LABEL_LENGTH]
+        self._subnet_dns_label = f"sub{FLAGS.run_uri}"[:MAX_DNS_LABEL_LENGTH]
+        self._base_argv = util.OCI_PREFIX + ["--profile", profile]
+        self._vcn_args = []
+        self.use_sdk = FLAGS.oci_use_sdk
+        # (VirtualNetworkClient, WorkRequestClient), built on first use.
+        self._sdk_clients = None
+        # Pending create work request ids, keyed by the created resource's id.
+        self._work_request_ids = {}
+        self.compartment_id = None
+        if self.use_sdk:
+            self.compartment_id = util.GetCompartmentId(profile)
+            if not self.compartment_id:
+                raise errors.Config.MissingOption(
+                    "--oci_use_sdk needs a compartment: set --oci_compartment_id "
+                    "or compartment-id for profile %s in %s"
+                    % (profile, util.OCI_CLI_RC_PATH)
+                )
+
+    def __getstate__(self):
+        """Returns the state to pickle, without the SDK clients.
+
+        The clients hold keys and sessions that cannot be pickled. They are
+        rebuilt on first use after unpickling.
+        """
+        state = self.__dict__.copy()
+        state["_sdk_clients"] = None
+        return state
+
+    def _GetSdkClients(self):
+        """Returns the SDK clients, building them if needed."""
+        if self._sdk_clients is None:
+            # Reads the config, session token and key once for both clients.
+            client_kwargs = _GetSdkClientKwargs(self.profile)
+            self._sdk_clients = (
+                _GetVirtualNetworkClient(client_kwargs),
+                _GetWorkRequestClient(client_kwargs),
+            )
+        return self._sdk_clients
+
+    @property
+    def _vn_client(self):
+        """The SDK VirtualNetworkClient, or None when using the OCI CLI."""
+        return self._GetSdkClients()[0] if self.use_sdk else None
+
+    @property
+    def _wr_client(self):
+        """The SDK WorkRequestClient, or None when using the OCI CLI."""
+        return self._GetSdkClients()[1] if self.use_sdk else None
+
+    def _TrackWorkRequest(self, resource_id, response):
+        """Remembers the work request of an SDK create response, if it has one."""
+        work_request_id = response.headers.get("opc-work-request-id")
+        if work_request_id:
+            self._work_request_ids[resource_id] = work_request_id
+
+    def _WaitForCreateWorkRequest(self, resource_id, status_list):
+        """Waits on the work request that created resource_id, if there is one.
+
+        Args:
+          resource_id: The OCID of the created resource.
+          status_list: The lifecycle states the caller is waiting for.
+
+        Returns:
+          True if the resource is known to be AVAILABLE and no lifecycle-state
+          poll is needed.
+        """
+        if "AVAILABLE" not in status_list:
+            return False
+        work_request_id = self._work_request_ids.pop(resource_id, None)
+        if not work_request_id:
+            return False
+        _WaitForWorkRequest(self._wr_client, work_request_id)
+        self.status = "AVAILABLE"
+        return True
 
-    @vm_util.Retry(poll_interval=60, log_errors=False)
     def WaitForVcnStatus(self, status_list):
-        """Waits until the disk's status is in status_list."""
-        logging.info("Waiting until the instance status is: %s" % status_list)
-        status_cmd = util.OCI_PREFIX + [
-            "network",
-            "vcn",
-            "get",
-            f"--vcn-id {self.vcn_id}",
-            f"--profile {self.profile}",
-        ]
-        status_cmd = util.GetEncodedCmd(status_cmd)
-        out, _ = vm_util.IssueRetryableCommand(status_cmd)
-        state = json.loads(out)
-        check_state = state["data"]["lifecycle-state"]
-        self.status = check_state
-        assert check_state in status_list
+        """Waits until the VCN's status is in status_list."""
+        logging.info("Waiting until the VCN status is: %s", status_list)
+        if self._vn_client:
+            if self._WaitForCreateWorkRequest(self.vcn_id, status_list):
+                return
+            response = self._vn_client.get_vcn(self.vcn_id)
+            vcn = _WaitForSdkState(self._vn_client, response, status_list)
+            # The response also has the default route table and security list.
+            self._vcn_details[self.vcn_id] = _VcnDetailsFromSdk(vcn)
+            self.status = vcn.lifecycle_state
+        else:
+            status_cmd = self._base_argv + ["network", "vcn", "get"] + self._vcn_args
+            details = _PollUntilState(status_cmd, status_list)
+            # The response also has the default route table and security list.
+            self._vcn_details[self.vcn_id] = details
+            self.status = details["lifecycle-state"]
 
     def GetVcnIDFromName(self):
         """Gets VCN OCIid from Name"""
-        get_cmd = util.OCI_PREFIX + [
-            "network",
-            "vcn",
-            "list",
-            f"--display-name {self.name}",
-        ]
-        get_cmd = util.GetEncodedCmd(get_cmd)
-        logging.info(get_cmd)
-        stdout, _, _ = vm_util.IssueCommand(get_cmd, raise_on_failure=False)
-        response = json.loads(stdout)
-        self.vcn_id = response["data"][0]["id"]
+        if self.vcn_id:
+            # Already looked up, e.g. by an earlier attempt of a retried Create.
+            return
+        if self._vn_client:
+            response = self._vn_client.list_vcns(
+                self.compartment_id, display_name=self.name
+            )
+            self.vcn_id = response.data[0].id
+        else:
+            get_cmd = self._base_argv + [
+                "network",
+                "vcn",
+                "list",
+                "--display-name",
+                self.name,
+            ]
+            logging.info(get_cmd)
+            stdout, _, _ = vm_util.IssueCommand(get_cmd, raise_on_failure=False)
+            response = _JsonLoads(stdout)
+            self.vcn_id = response["data"][0]["id"]
+        self._vcn_args = ["--vcn-id", self.vcn_id]
         logging.info(self.vcn_id)
 
     def _Create(self):
         """Creates the VPC."""
         logging.info("Creating custom CIDR Block")
-        create_cmd = util.OCI_PREFIX + [
-            "network",
-            "vcn",
-            "create",
-            f"--display-name pkb-{FLAGS.run_uri}",
-            f"--dns-label vcn{FLAGS.run_uri}",
-            f"--freeform-tags {self.tags}",
-            '--from-json \'{"cidr-blocks":["172.16.0.0/16"]}\'',
-            f"--profile {self.profile}",
-        ]
-        create_cmd = util.GetEncodedCmd(create_cmd)
-        logging.info(create_cmd)
-        stdout, _, _ = vm_util.IssueCommand(create_cmd, raise_on_failure=False)
-        response = json.loads(stdout)
-        self.vcn_id = response["data"]["id"]
-        self.cidr_block = response["data"]["cidr-block"]
+        if self._vn_client:
+            response = self._vn_client.create_vcn(
+                oci.core.models.CreateVcnDetails(
+                    compartment_id=self.compartment_id,
+                    display_name=self._display_name,
+                    dns_label=self._vcn_dns_label,
+                    freeform_tags=self.tags,
+                    cidr_blocks=self.cidr_blocks,
+                )
+            )
+            self.vcn_id = response.data.id
+            self.cidr_block = response.data.cidr_block
+            self._TrackWorkRequest(self.vcn_id, response)
+        else:
+            create_cmd = self._base_argv + [
+                "network",
+                "vcn",
+                "create",
+                "--display-name",
+                self._display_name,
+                "--dns-label",
+                self._vcn_dns_label,
+                "--freeform-tags",
+                _JsonDumps(self.tags),
+                "--from-json",
+                _JsonDumps({"cidr-blocks": self.cidr_blocks}),
+            ]
+            logging.info(create_cmd)
+            stdout, _, _ = vm_util.IssueCommand(create_cmd, raise_on_failure=False)
+            response = _JsonLoads(stdout)
+            self.vcn_id = response["data"]["id"]
+            self.cidr_block = response["data"]["cidr-block"]
+        self._vcn_args = ["--vcn-id", self.vcn_id]
 
     def _Delete(self):
-        delete_cmd = util.OCI_PREFIX + [
-            "network",
-            "vcn",
-            "delete",
-            f"--vcn-id {self.vcn_id}",
-            f"--profile {self.profile}",
-            "--force",
-        ]
-        delete_cmd = util.GetEncodedCmd(delete_cmd)
-        stdout, _, _ = vm_util.IssueCommand(delete_cmd, raise_on_failure=False)
+        self._vcn_details.pop(self.vcn_id, None)
+        if self._vn_client:
+            self._vn_client.delete_vcn(self.vcn_id)
+        else:
+            delete_cmd = (
+                self._base_argv
+                + ["network", "vcn", "delete", "--force"]
+                + self._vcn_args
+            )
+            stdout, _, _ = vm_util.IssueCommand(delete_cmd, raise_on_failure=False)
 
     def GetSubnetIdFromVCNId(self):
         """Gets Subnet OCIid from Name"""
-        get_cmd = util.OCI_PREFIX + [
-            "network",
-            "subnet",
-            "list",
-            f"--vcn-id {self.vcn_id}",
-            f"--profile {self.profile}",
-        ]
-        get_cmd = util.GetEncodedCmd(get_cmd)
-        logging.info(get_cmd)
-        stdout, _, _ = vm_util.IssueCommand(get_cmd, raise_on_failure=False)
-        response = json.loads(stdout)
-        self.subnet_id = response["data"][0]["id"]
-
-    @vm_util.Retry(poll_interval=60, log_errors=False)
+        if self._vn_client:
+            response = self._vn_client.list_subnets(
+                self.compartment_id, vcn_id=self.vcn_id
+            )
+            self.subnet_id = response.data[0].id
+        else:
+            get_cmd = self._base_argv + ["network", "subnet", "list"] + self._vcn_args
+            logging.info(get_cmd)
+            stdout, _, _ = vm_util.IssueCommand(get_cmd, raise_on_failure=False)
+            response = _JsonLoads(stdout)
+            self.subnet_id = response["data"][0]["id"]
+
     def WaitForSubnetStatus(self, status_list):
-        """Waits until the disk's status is in status_list."""
-        logging.info("Waiting until the instance status is: %s" % status_list)
-        status_cmd = util.OCI_PREFIX + [
-            "network",
-            "subnet",
-            "get",
-            f"--subnet-id {self.subnet_id}",
-            f"--profile {self.profile}",
-        ]
-        status_cmd = util.GetEncodedCmd(status_cmd)
-        out, _ = vm_util.IssueRetryableCommand(status_cmd)
-        state = json.loads(out)
-        check_state = state["data"]["lifecycle-state"]
-        self.status = check_state
-        assert check_state in status_list
+        """Waits until the subnet's status is in status_list."""
+        logging.info("Waiting until the subnet status is: %s", status_list)
+        if self._vn_client:
+            if self._WaitForCreateWorkRequest(self.subnet_id, status_list):
+                return
+            response = self._vn_client.get_subnet(self.subnet_id)
+            self.status = _WaitForSdkState(
+                self._vn_client, response, status_list
+            ).lifecycle_state
+        else:
+            status_cmd = self._base_argv + [
+                "network",
+                "subnet",
+                "get",
+                "--subnet-id",
+                self.subnet_id,
+            ]
+            self.status = _PollUntilState(status_cmd, status_list)["lifecycle-state"]
 
     def CreateSubnet(self):
         """Creates the VPC."""
         logging.info("Creating custom subnet Block")
-        create_cmd = util.OCI_PREFIX + [
-            "network",
-            "subnet",
-            "create",
-            f"--display-name pkb-{FLAGS.run_uri}",
-            f"--dns-label sub{FLAGS.run_uri}",
-            f"--cidr-block {self.cidr_block}",
-            f"--vcn-id {self.vcn_id}",
-            f"--profile {self.profile}",
-        ]
-        create_cmd = util.GetEncodedCmd(create_cmd)
-        stdout, _, _ = vm_util.IssueCommand(create_cmd, raise_on_failure=False)
-        response = json.loads(stdout)
-        self.subnet_id = response["data"]["id"]
+        if self._vn_client:
+            response = self._vn_client.create_subnet(
+                oci.core.models.CreateSubnetDetails(
+                    compartment_id=self.compartment_id,
+                    display_name=self._display_name,
+                    dns_label=self._subnet_dns_label,
+                    cidr_block=self.cidr_block,
+                    vcn_id=self.vcn_id,
+                )
+            )
+            self.subnet_id = response.data.id
+            self._TrackWorkRequest(self.subnet_id, response)
+        else:
+            create_cmd = (
+                self._base_argv
+                + [
+                    "network",
+                    "subnet",
+                    "create",
+                    "--display-name",
+                    self._display_name,
+                    "--dns-label",
+                    self._subnet_dns_label,
+                    "--cidr-block",
+                    self.cidr_block,
+                ]
+                + self._vcn_args
+            )
+            stdout, _, _ = vm_util.IssueCommand(create_cmd, raise_on_failure=False)
+            response = _JsonLoads(stdout)
+            self.subnet_id = response["data"]["id"]
 
     def DeleteSubnet(self):
         """Creates the VPC."""
         logging.info("Creating custom subnet Block")
-        create_cmd = util.OCI_PREFIX + [
-            "network",
-            "subnet",
-            "delete",
-            f"--subnet-id {self.subnet_id}",
-            f"--profile {self.profile}",
-            "--force",
-        ]
-        create_cmd = util.GetEncodedCmd(create_cmd)
-        stdout, _, _ = vm_util.IssueCommand(create_cmd, raise_on_failure=False)
+        if self._vn_client:
+            self._vn_client.delete_subnet(self.subnet_id)
+            _WaitForSdkDeletion(
+                self._vn_client, self._vn_client.get_subnet, self.subnet_id
+            )
+        else:
+            create_cmd = self._base_argv + [
+                "network",
+                "subnet",
+                "delete",
+                "--subnet-id",
+                self.subnet_id,
+                "--force",
+                *_CLI_DELETE_WAIT_ARGS,
+            ]
+            stdout, _, _ = vm_util.IssueCommand(
+                create_cmd,
+                timeout=WAIT_INTERVAL_SECONDS + vm_util.DEFAULT_TIMEOUT,
+                raise_on_failure=False,
+            )
 
     def WaitForInternetGatewayStatus(self, status_list):
-        """Waits until the disk's status is in status_list."""
-        logging.info("Waiting until the instance status is: %s", status_list)
-        status_cmd = util.OCI_PREFIX + [
-            "network",
-            "internet-gateway",
-            "get",
-            f"--ig-id {self.ig_id}",
-            f"--profile {self.profile}",
-        ]
-        status_cmd = util.GetEncodedCmd(status_cmd)
-        out, _ = vm_util.IssueRetryableCommand(status_cmd)
-        state = json.loads(out)
-        check_state = state["data"]["lifecycle-state"]
-        self.status = check_state
-        assert check_state in status_list
+        """Waits until the internet gateway's status is in status_list."""
+        logging.info("Waiting until the internet gateway status is: %s", status_list)
+        if self._vn_client:
+            if self._WaitForCreateWorkRequest(self.ig_id, status_list):
+                return
+            response = self._vn_client.get_internet_gateway(self.ig_id)
+            self.status = _WaitForSdkState(
+                self._vn_client, response, status_list
+            ).lifecycle_state
+        else:
+            status_cmd = self._base_argv + [
+                "network",
+                "internet-gateway",
+                "get",
+                "--ig-id",
+                self.ig_id,
+            ]
+            self.status = _PollUntilState(status_cmd, status_list)["lifecycle-state"]
 
     def CreateInternetGateway(self):
         """Creates the Internet Gateway."""
         logging.info("Creating custom Internet Gateway")
-        create_cmd = util.OCI_PREFIX + [
-            "network",
-            "internet-gateway",
-            "create",
-            f"--display-name pkb-{FLAGS.run_uri}",
-            f"--vcn-id {self.vcn_id}",
-            f"--profile {self.profile}",
-            "--is-enabled  True",
-        ]
-        create_cmd = util.GetEncodedCmd(create_cmd)
-        stdout, _, _ = vm_util.IssueCommand(create_cmd, raise_on_failure=False)
-        response = json.loads(stdout)
-        self.ig_id = response["data"]["id"]
+        if self._vn_client:
+            response = self._vn_client.create_internet_gateway(
+                oci.core.models.CreateInternetGatewayDetails(
+                    compartment_id=self.compartment_id,
+                    display_name=self._display_name,
+                    vcn_id=self.vcn_id,
+                    is_enabled=True,
+                )
+            )
+            self.ig_id = response.data.id
+            self._TrackWorkRequest(self.ig_id, response)
+        else:
+            create_cmd = (
+                self._base_argv
+                + [
+                    "network",
+                    "internet-gateway",
+                    "create",
+                    "--display-name",
+                    self._display_name,
+                    "--is-enabled",
+                    "True",
+                ]
+                + self._vcn_args
+            )
+            stdout, _, _ = vm_util.IssueCommand(create_cmd, raise_on_failure=False)
+            response = _JsonLoads(stdout)
+            self.ig_id = response["data"]["id"]
 
     def DeleteInternetGateway(self):
         """Creates the VPC."""
         logging.info("Creating custom subnet Block")
-        create_cmd = util.OCI_PREFIX + [
-            "network",
-            "internet-gateway",
-            "delete",
-            f"--ig-id {self.ig_id}",
-            f"--profile {self.profile}",
-            "--force",
-        ]
-        create_cmd = util.GetEncodedCmd(create_cmd)
-        stdout, _, _ = vm_util.IssueCommand(create_cmd, raise_on_failure=False)
+        if self._vn_client:
+            self._vn_client.delete_internet_gateway(self.ig_id)
+            _WaitForSdkDeletion(
+                self._vn_client, self._vn_client.get_internet_gateway, self.ig_id
+            )
+        else:
+            create_cmd = self._base_argv + [
+                "network",
+                "internet-gateway",
+                "delete",
+                "--ig-id",
+                self.ig_id,
+                "--force",
+                *_CLI_DELETE_WAIT_ARGS,
+            ]
+            stdout, _, _ = vm_util.IssueCommand(
+                create_cmd,
+                timeout=WAIT_INTERVAL_SECONDS + vm_util.DEFAULT_TIMEOUT,
+                raise_on_failure=False,
+            )
 
     def WaitForRouteTableStatus(self, status_list):
-        """Waits until the disk's status is in status_list."""
-        logging.info("Waiting until the instance status is: %s", status_list)
-        status_cmd = util.OCI_PREFIX + [
-            "network",
-            "route-table",
-            "get",
-            f"--rt-id {self.rt_id}",
-            f"--profile {self.profile}",
-        ]
-        status_cmd = util.GetEncodedCmd(status_cmd)
-        out, _ = vm_util.IssueRetryableCommand(status_cmd)
-        state = json.loads(out)
-        check_state = state["data"]["lifecycle-state"]
-        self.status = check_state
-        assert check_state in status_list
-
-    def WaitForSecurityListStatus(self, status_list):
-        """Waits until the disk's status is in status_list."""
-        logging.info("Waiting until the instance status is: %s", status_list)
-        status_cmd = util.OCI_PREFIX + [
-            "network",
-            "security-list",
-            "get",
-            f"--security-list-id {self.security_list_id}",
-            f"--profile {self.profile}",
-        ]
-        status_cmd = util.GetEncodedCmd(status_cmd)
-        out, _ = vm_util.IssueRetryableCommand(status_cmd)
-        state = json.loads(out)
-        check_state = state["data"]["lifecycle-state"]
-        self.status = check_state
-        assert check_state in status_list
+        """Waits until the route table's status is in status_list."""
+        logging.info("Waiting until the route table status is: %s", status_list)
+        if self._vn_client:
+            response = self._vn_client.get_route_table(self.rt_id)
+            self.status = _WaitForSdkState(
+                self._vn_client, response, status_list
+            ).lifecycle_state
+        else:
+            status_cmd = self._base_argv + [
+                "network",
+                "route-table",
+                "get",
+                "--rt-id",
+                self.rt_id,
+            ]
+            self.status = _PollUntilState(status_cmd, status_list)["lifecycle-state"]
+
+    def WaitForSecurityListStatus(self, status_list, reported_state=None):
+        """Waits until the security list's status is in status_list.
+
+        Args:
+          status_list: lifecycle states to wait for.
+          reported_state: state already returned by the preceding update, if
+            any. No poll is issued when it is in status_list.
+        """
+        if reported_state in status_list:
+            self.status = reported_state
+            return
+        logging.info("Waiting until the security list status is: %s", status_list)
+        if self._vn_client:
+            response = self._vn_client.get_security_list(self.security_list_id)
+            self.status = _WaitForSdkState(
+                self._vn_client, response, status_list
+            ).lifecycle_state
+        else:
+            status_cmd = self._base_argv + [
+                "network",
+                "security-list",
+                "get",
+                "--security-list-id",
+                self.security_list_id,
+            ]
+            self.status = _PollUntilState(status_cmd, status_list)["lifecycle-state"]
 
     def UpdateRouteTable(self):
         """Updates the Route Table."""
         logging.info("Update Routing Table with Internet Gateway")
-        create_cmd = util.OCI_PREFIX + [
-            "network",
-            "route-table",
-            "update",
-            f"--rt-id {self.rt_id}",
-            "--force",
-            '--route-rules \'[{"cidrBlock":"0.0.0.0/0","networkEntityId":"%s"}]\''
-            % self.ig_id,
-            f"--profile {self.profile}",
-        ]
-        create_cmd = util.GetEncodedCmd(create_cmd)
-        stdout, _, _ = vm_util.IssueCommand(create_cmd, raise_on_failure=False)
+        if self._vn_client:
+            route_rule = oci.core.models.RouteRule(
+                destination="0.0.0.0/0",
+                destination_type="CIDR_BLOCK",
+                network_entity_id=self.ig_id,
+            )
+            self._vn_client.update_route_table(
+                self.rt_id,
+                oci.core.models.UpdateRouteTableDetails(route_rules=[route_rule]),
+            )
+        else:
+            create_cmd = self._base_argv + [
+                "network",
+                "route-table",
+                "update",
+                "--rt-id",
+                self.rt_id,
+                "--force",
+                "--route-rules",
+                _JsonDumps([{"cidrBlock": "0.0.0.0/0", "networkEntityId": self.ig_id}]),
+            ]
+            stdout, _, _ = vm_util.IssueCommand(create_cmd, raise_on_failure=False)
 
     def ClearRouteTable(self):
         """Updates the Route Table."""
         logging.info("Update Routing Table with Internet Gateway")
-        create_cmd = util.OCI_PREFIX + [
-            "network",
-            "route-table",
-            "update",
-            f"--rt-id {self.rt_id}",
-            "--force",
-            "--route-rules '[]'",
-            f"--profile {self.profile}",
-        ]
-        create_cmd = util.GetEncodedCmd(create_cmd)
-        stdout, _, _ = vm_util.IssueCommand(create_cmd, raise_on_failure=False)
+        if self._vn_client:
+            self._vn_client.update_route_table(
+                self.rt_id, oci.core.models.UpdateRouteTableDetails(route_rules=[])
+            )
+        else:
+            create_cmd = self._base_argv + [
+                "network",
+                "route-table",
+                "update",
+                "--rt-id",
+                self.rt_id,
+                "--force",
+                "--route-rules",
+                "[]",
+            ]
+            stdout, _, _ = vm_util.IssueCommand(create_cmd, raise_on_failure=False)
+
+    def AddSecurityListIngressRules(self, rules):
+        """Updates security list with several ingress rules at once.
+
+        The current rules are fetched once and a single update is issued for
+        all of the new rules.
+
+        Args:
+          rules: list of ingress rule dicts, as built by _MakeIngressRule.
+
+        Returns:
+          The lifecycle state reported by the update, or None if unknown.
+        """
+        current_security_rules = self.GetSecurityListFromId()
+        if self._vn_client:
+            current_security_rules.extend(_IngressRuleToSdk(rule) for rule in rules)
+            response = self._vn_client.update_security_list(
+                self.security_list_id,
+                oci.core.models.UpdateSecurityListDetails(
+                    ingress_security_rules=current_security_rules
+                ),
+            )
+            return response.data.lifecycle_state
+        else:
+            current_security_rules.extend(rules)
+
+            cmd = self._base_argv + [
+                "network",
+                "security-list",
+                "update",
+                "--security-list-id",
+                self.security_list_id,
+                "--force",
+                "--ingress-security-rules",
+                _JsonDumps(current_security_rules),
+            ]
+
+            stdout, _, retcode = vm_util.IssueCommand(cmd, raise_on_failure=False)
+            if retcode or not stdout:
+                return None
+            return _JsonLoads(stdout)["data"]["lifecycle-state"]
 
     def AddSecurityListIngressRule(
         self,
@@ -322,110 +873,59 @@ class OciVcn(resource.BaseResource):
         protocol_type=None,
         protocol_code=None,
     ):
-        if not end_port:
-            end_port = start_port
-        end_port = end_port or start_port
-        source_range = source_range or "0.0.0.0/0"
-
-        current_security_rules = self.GetSecurityListFromId()
-        # tcp =6 #udp=17
-
         """Updates security list to allow traffic on a specific port"""
-        logging.info(f"Add ingress rule for ports {start_port} : {end_port}")
-        # start_port=22, end_port=None, source_range=None, protocol_type=None, protocol_code=None
-        source = '"source":"%s" ,' % source_range
-
-        protocol_str = '"protocol": "%s" ,' % protocol
-        if protocol == "1":
-            if protocol_type is None and protocol_code is None:
-                icmp_options = '"icmp-options": null,'
-            else:
-                icmp_options = '"icmp-options": { "code": %s, "type": %s},' % (
-                    str(protocol_code),
-                    str(protocol_type),
+        return self.AddSecurityListIngressRules(
+            [
+                _MakeIngressRule(
+                    protocol=protocol,
+                    start_port=start_port,
+                    end_port=end_port,
+                    source_range=source_range,
+                    protocol_type=protocol_type,
+                    protocol_code=protocol_code,
                 )
-            start_port = None
-        else:
-            icmp_options = '"icmp-options": null,'
-
-        if start_port:
-            tcpOptions = (
-                '"tcp-options":{"destinationPortRange": {"max": %s, "min": %s }},'
-                % (str(end_port), str(start_port))
-            )
-        else:
-            tcpOptions = '"tcp-options": null,'
-
-        udp_options = '"udp-options": null'
-
-        rule_json_string = '{%s %s %s "is-stateless": false, %s %s }' % (
-            source,
-            icmp_options,
-            protocol_str,
-            tcpOptions,
-            udp_options,
+            ]
         )
 
-        current_security_rules.append(json.loads(rule_json_string))
-
-        current_security_rules_str = json.dumps(current_security_rules)
-        current_security_rules_str = "'%s'" % current_security_rules_str
-        cmd = util.OCI_PREFIX + [
-            "network",
-            "security-list",
-            "update",
-            f"--security-list-id {self.security_list_id}",
-            "--force",
-            f"--ingress-security-rules {current_security_rules_str}",
-            f"--profile {self.profile}",
-        ]
-
-        cmd = util.GetEncodedCmd(cmd)
-        stdout, _, _ = vm_util.IssueCommand(cmd, raise_on_failure=False)
-
     def GetSecurityListFromId(self):
-        cmd = util.OCI_PREFIX + [
-            "network",
-            "security-list",
-            "get",
-            f"--security-list-id {self.security_list_id}",
-            f"--profile {self.profile}",
-        ]
-        get_cmd = util.GetEncodedCmd(cmd)
-        logging.info(get_cmd)
-        stdout, _, _ = vm_util.IssueCommand(get_cmd, raise_on_failure=False)
-        response = json.loads(stdout)
-        ingress_rules = response["data"]["ingress-security-rules"]
+        if self._vn_client:
+            response = self._vn_client.get_security_list(self.security_list_id)
+            ingress_rules = response.data.ingress_security_rules
+        else:
+            get_cmd = self._base_argv + [
+                "network",
+                "security-list",
+                "get",
+                "--security-list-id",
+                self.security_list_id,
+            ]
+            stdout, _, _ = util.IssueCommandBytes(get_cmd, raise_on_failure=False)
+            response = _JsonLoads(stdout)
+            ingress_rules = response["data"]["ingress-security-rules"]
         logging.info(ingress_rules)
         return ingress_rules
 
-    def GetDefaultRouteTableId(self):
-        """Get Default Route Table OCI Id."""
-        status_cmd = util.OCI_PREFIX + [
-            "network",
-            "vcn",
-            "get",
-            f"--vcn-id {self.vcn_id}",
-            f"--profile {self.profile}",
-        ]
-        status_cmd = util.GetEncodedCmd(status_cmd)
-        out, _, _ = vm_util.IssueCommand(status_cmd)
-        state = json.loads(out)
-        self.rt_id = state["data"]["default-route-table-id"]
-
-    def GetDefaultSecurityListId(self):
-        """Get Default Route Table OCI Id."""
-        status_cmd = util.OCI_PREFIX + [
-            "network",
-            "vcn",
-            "get",
-            f"--vcn-id {self.vcn_id}",
-            f"--profile {self.profile}",
-        ]
-        status_cmd = util.GetEncodedCmd(status_cmd)
-        out, _, _ = vm_util.IssueCommand(status_cmd)
-        state = json.loads(out)
-        self.security_list_id = state["data"]["default-security-list-id"]
+    def _FetchVcnDetails(self):
+        """Returns the VCN's details, issuing `vcn get` at most once per VCN."""
+        if self.vcn_id not in self._vcn_details:
+            if self._vn_client:
+                details = _VcnDetailsFromSdk(self._vn_client.get_vcn(self.vcn_id).data)
+            else:
+                get_cmd = self._base_argv + ["network", "vcn", "get"] + self._vcn_args
+                out, _, _ = util.IssueCommandBytes(get_cmd)
+                details = _JsonLoads(out)["data"]
+            self._vcn_details[self.vcn_id] = details
+        return self._vcn_details[self.vcn_id]
+
+    @property
+    def rt_id(self):
+        """OCI Id of the VCN's default route table."""
+        return self._FetchVcnDetails()["default-route-table-id"]
+
+    @property
+    def security_list_id(self):
+        """OCI Id of the VCN's default security list."""
+        return self._FetchVcnDetails()["default-security-list-id"]
 
 
 class OciNetwork(network.BaseNetwork):
@@ -433,11 +933,11 @@ class OciNetwork(network.BaseNetwork):
 
     CLOUD = provider_info.OCI
 
+    # Generated name suffixes, keyed by run_uri.
+    _name_suffixes = {}
+
     def __init__(self, spec):
         super(OciNetwork, self).__init__(spec)
-        self.name = FLAGS.oci_network_name or (
-            "perfkit-%s-%s" % (FLAGS.run_uri, str(uuid.uuid4())[-12:])
-        )
         self.profile = spec.zone
         self.region = spec.zone
         self.use_vcn = FLAGS.oci_use_vcn
@@ -448,27 +948,55 @@ class OciNetwork(network.BaseNetwork):
             self.vcn = OciVcn(self.name, self.region, self.profile)
             self.security_group = None
 
+    @functools.cached_property
+    def name(self):
+        """The network name, unless set by --oci_network_name.
+
+        The generated uuid suffix is shared by all networks of a run, so they
+        all get the same name.
+        """
+        if FLAGS.oci_network_name:
+            return FLAGS.oci_network_name
+        suffix = OciNetwork._name_suffixes.get(FLAGS.run_uri)
+        if suffix is None:
+            suffix = OciNetwork._name_suffixes.setdefault(
+                FLAGS.run_uri, uuid.uuid4().hex[:12]
+            )
+        return "perfkit-%s-%s" % (FLAGS.run_uri, suffix)
+
 
-    @vm_util.Retry()
+    @vm_util.Retry(retryable_exceptions=_RETRYABLE_CREATE_ERRORS)
     def Create(self):
         """Creates the network."""
         if self.use_vcn:
             self.vcn.Create()
             self.vcn.WaitForVcnStatus(["AVAILABLE"])
-            self.vcn.GetDefaultRouteTableId()
-            self.vcn.GetDefaultSecurityListId()
-            self.vcn.CreateSubnet()
-            self.vcn.WaitForSubnetStatus(["AVAILABLE"])
+            # The subnet and the internet gateway only depend on the VCN, so
+            # create them (and wait for them) concurrently.
+            background_tasks.RunParallelThreads(
+                [
+                    (self.vcn.CreateSubnet, [], {}),
+                    (self.vcn.CreateInternetGateway, [], {}),
+                ],
+                max_concurrency=2,
+            )
+            _RunParallelWaits(
+                [
+                    (self.vcn.WaitForSubnetStatus, [["AVAILABLE"]]),
+                    (self.vcn.WaitForInternetGatewayStatus, [["AVAILABLE"]]),
+                ]
+            )
             self.network_id = self.vcn.subnet_id
-            self.vcn.CreateInternetGateway()
-            self.vcn.WaitForInternetGatewayStatus(["AVAILABLE"])
             self.vcn.UpdateRouteTable()
             self.vcn.WaitForRouteTableStatus(["AVAILABLE"])
-            # Add opening in VCN for SSH
-            self.vcn.AddSecurityListIngressRule(protocol="6", start_port=22)
-            self.vcn.WaitForSecurityListStatus(["AVAILABLE"])
-            self.vcn.AddSecurityListIngressRule(protocol="1")
-            self.vcn.WaitForSecurityListStatus(["AVAILABLE"])
+            # Add opening in VCN for SSH and ICMP
+            state = self.vcn.AddSecurityListIngressRules(
+                [
+                    _MakeIngressRule(protocol="6", start_port=22),
+                    _MakeIngressRule(protocol="1"),
+                ]
+            )
+            self.vcn.WaitForSecurityListStatus(["AVAILABLE"], reported_state=state)
 
         else:
             self.vcn.GetVcnIDFromName()
@@ -479,9 +1007,18 @@ class OciNetwork(network.BaseNetwork):
         """Deletes the network."""
         if self.use_vcn:
             self.vcn.ClearRouteTable()
-            self.vcn.DeleteInternetGateway()
-            self.vcn.DeleteSubnet()
-            self.vcn.Delete()
+            # Once the route table no longer references the internet gateway,
+            # the gateway and the subnet can be deleted concurrently.
+            try:
+                background_tasks.RunParallelThreads(
+                    [
+                        (self.vcn.DeleteInternetGateway, [], {}),
+                        (self.vcn.DeleteSubnet, [], {}),
+                    ],
+                    max_concurrency=2,
+                )
+            finally:
+                self.vcn.Delete()
 
 
 class OCIFirewall(network.BaseFirewall):
@@ -508,13 +1045,15 @@ class OCIFirewall(network.BaseFirewall):
             )
 
         else:
-            vm.network.vcn.AddSecurityListIngressRule(
+            state = vm.network.vcn.AddSecurityListIngressRule(
                 protocol="6",
                 start_port=start_port,
                 end_port=end_port,
                 source_range=source_range,
             )
-            vm.network.vcn.WaitForRouteTableStatus(["AVAILABLE"])
+            vm.network.vcn.WaitForSecurityListStatus(
+                ["AVAILABLE"], reported_state=state
+            )
 
     def AllowIcmp(self, vm, protocol_type=None, protocol_code=None, source_range=None):
         """Opens the ICMP protocol on the firewall.
@@ -527,11 +1066,13 @@ class OCIFirewall(network.BaseFirewall):
                 "Allow ICMP with OCI cloud only supported when using a VCN for now!"
             )
         else:
-            vm.network.vcn.AddSecurityListIngressRule(
+            state = vm.network.vcn.AddSecurityListIngressRule(
                 protocol="1",
                 protocol_type=protocol_type,
                 protocol_code=protocol_code,
                 source_range=source_range,
             )
-            vm.network.vcn.WaitForRouteTableStatus(["AVAILABLE"])
+            vm.network.vcn.WaitForSecurityListStatus(
+                ["AVAILABLE"], reported_state=state
+            )
             # protocol="6", start_port=22, end_port=None, source_range=None, protocol_type=None, protocol_code=None
@@ -14,16 +14,25 @@
 
 """Utilities for working with OracleCloud Web Services resources."""
 
+import configparser
+import logging
+import os
 import shlex
+import subprocess
 
 from absl import flags
+from perfkitbenchmarker import errors
 from perfkitbenchmarker import vm_util
 import six
 import json
 from perfkitbenchmarker import context
 
+FLAGS = flags.FLAGS
+
 OCI_PREFIX = ["oci"]
 
+OCI_CLI_RC_PATH = "~/.oci/oci_cli_rc"
+
 oci_suffix = ""
 
 ADD_CLOUDINIT_TEMPLATE = """#!/bin/bash
@@ -66,6 +75,75 @@ def GetEncodedCmd(cmd):
     return cmd_args
 
 
+def IssueCommandBytes(cmd, timeout=vm_util.DEFAULT_TIMEOUT, raise_on_failure=True):
+    """Runs a command once and returns its undecoded stdout.
+
+    vm_util.IssueCommand decodes stdout to str before returning it. Large JSON
+    documents, such as a security list with many rules, can instead be handed
+    to the JSON parser as bytes, skipping the decode and copy.
+
+    This is deliberately a minimal variant for short `oci ... get` calls: it
+    does not inject an environment, log stdout or kill the process group on
+    timeout like vm_util.IssueCommand does. Use that for anything else.
+
+    Args:
+      cmd: A list of strings such as is given to the subprocess.Popen()
+        constructor.
+      timeout: Timeout for the command in seconds.
+      raise_on_failure: A boolean indicating if non-zero return codes should
+        raise IssueCommandError.
+
+    Returns:
+      A tuple of stdout as bytes, stderr as str, and retcode.
+
+    Raises:
+      IssueCommandError: When raise_on_failure=True and retcode is non-zero.
+      IssueCommandTimeoutError: When the command duration exceeds timeout.
+    """
+    full_cmd = " ".join(cmd)
+    logging.info("Running: %s", full_cmd)
+    try:
+        process = subprocess.run(
+            cmd,
+            stdin=subprocess.DEVNULL,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE,
+            timeout=timeout,
+            check=False,
+        )
+    except subprocess.TimeoutExpired as e:
+        raise errors.VmUtil.IssueCommandTimeoutError(
+            "Command timed out after %s seconds: %s" % (timeout, full_cmd)
+        ) from e
+    stderr = process.stderr.decode(errors="replace")
+    if process.returncode and raise_on_failure:
+        raise errors.VmUtil.IssueCommandError(
+            "Ran: {%s}\nReturnCode:%s\nSTDERR: %s"
+            % (full_cmd, process.returncode, stderr)
+        )
+    return process.stdout, stderr, process.returncode
+
+
+def GetCompartmentId(profile):
+    """Gets the compartment to create resources in for the given profile.
+
+    The oci CLI reads the compartment-id default from ~/.oci/oci_cli_rc, but
+    the Python SDK does not, so it is looked up here.
+
+    Args:
+      profile: The name of the OCI profile.
+
+    Returns:
+      The value of --oci_compartment_id if set, otherwise the compartment-id of
+      the profile in the oci_cli_rc file.
+    """
+    if FLAGS.oci_compartment_id:
+        return FLAGS.oci_compartment_id
+    cli_rc = configparser.ConfigParser()
+    cli_rc.read(os.path.expanduser(OCI_CLI_RC_PATH))
+    return cli_rc.get(profile, "compartment-id", fallback=None)
+
+
 def GetOciImageIdFromImage(operating_system, operating_system_version, shape, profile):
     # oci compute image list --all --operating-system "Canonical Ubuntu" --operating-system-version 18.04 --shape
     # VM.Standard.A1.Flex -c ocid1.tenancy.oc1..aaaaaaaadfogwfmgjoi35onknsnu6u5zfp43gh657appkvbghhzyhfhh5oya
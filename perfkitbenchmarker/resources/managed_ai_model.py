@@ -19,6 +19,7 @@ resource, but the customer pays for the underlying resources it runs on, rather
 than simply for calls like with an API. This also gives the customer more
 control & ownership.
 """
+import functools
 import time
 from typing import Any
 
@@ -125,6 +126,7 @@ class BaseManagedAiModel(resource.BaseResource):
     return samples
 
 
+@functools.lru_cache()
 def GetManagedAiModelClass(
     cloud: str,
 ) -> resource.AutoRegisterResourceMeta | None:
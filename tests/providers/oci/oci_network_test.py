@@ -0,0 +1,474 @@
+# Copyright (c) 2024, Ampere Computing LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Tests for ampere.pkb.providers.oci.oci_network."""
+
+import json
+import pickle
+import unittest
+
+from absl import flags
+from absl.testing import parameterized
+from ampere.pkb.providers.oci import flags as oci_flags  # pylint: disable=unused-import
+from ampere.pkb.providers.oci import oci_network
+from ampere.pkb.providers.oci import util
+import mock
+from perfkitbenchmarker import errors
+from perfkitbenchmarker import vm_util
+from tests import pkb_common_test_case
+
+FLAGS = flags.FLAGS
+
+_GET_CMD = ['oci', 'network', 'vcn', 'get']
+
+
+def _GetResponse(state):
+  return json.dumps({'data': {'lifecycle-state': state}}), '', 0
+
+
+_FAILED_GET = ('', 'ServiceError: 503', 1)
+
+
+class PollUntilStateTest(pkb_common_test_case.PkbCommonTestCase):
+
+  def setUp(self):
+    super().setUp()
+    self.now = 0.0
+    self.enter_context(
+        mock.patch.object(oci_network.time, 'time', side_effect=self._Time)
+    )
+    self.mock_sleep = self.enter_context(
+        mock.patch.object(oci_network.time, 'sleep', side_effect=self._Sleep)
+    )
+    self.enter_context(
+        mock.patch.object(oci_network.random, 'uniform', return_value=0)
+    )
+
+  def _Time(self):
+    return self.now
+
+  def _Sleep(self, seconds):
+    self.now += seconds
+
+  def _MockIssueCommand(self, *responses):
+    return self.enter_context(
+        mock.patch.object(vm_util, 'IssueCommand', side_effect=responses)
+    )
+
+  def testReturnsReachedState(self):
+    issue_command = self._MockIssueCommand(
+        _GetResponse('PROVISIONING'), _GetResponse('AVAILABLE')
+    )
+    data = oci_network._PollUntilState(_GET_CMD, ['AVAILABLE'])
+    self.assertEqual(data, {'lifecycle-state': 'AVAILABLE'})
+    issue_command.assert_called_with(_GET_CMD, raise_on_failure=False)
+    self.mock_sleep.assert_called_once_with(2)
+
+  def testRetriesFailedPoll(self):
+    self._MockIssueCommand(_FAILED_GET, _GetResponse('AVAILABLE'))
+    data = oci_network._PollUntilState(_GET_CMD, ['AVAILABLE'])
+    self.assertEqual(data, {'lifecycle-state': 'AVAILABLE'})
+    self.mock_sleep.assert_called_once_with(2)
+
+  def testBacksOffUntilTimeout(self):
+    self._MockIssueCommand(*[_GetResponse('PROVISIONING')] * 10)
+    with self.assertRaises(vm_util.TimeoutExceededRetryError):
+      oci_network._PollUntilState(
+          _GET_CMD, ['AVAILABLE'], max_interval=8, timeout=30
+      )
+    self.assertEqual(
+        [c.args[0] for c in self.mock_sleep.call_args_list], [2, 4, 8, 8]
+    )
+
+  def testFailedPollsDoNotExtendTimeout(self):
+    self._MockIssueCommand(*[_FAILED_GET] * 10)
+    with self.assertRaises(vm_util.TimeoutExceededRetryError):
+      oci_network._PollUntilState(_GET_CMD, ['AVAILABLE'], timeout=10)
+    self.assertLess(self.now, 10)
+
+  def testRaisesOnTerminalState(self):
+    self._MockIssueCommand(_GetResponse('PROVISIONING'), _GetResponse('FAILED'))
+    with self.assertRaises(errors.Resource.CreationError):
+      oci_network._PollUntilState(_GET_CMD, ['AVAILABLE'])
+    self.mock_sleep.assert_called_once()
+
+  def testAwaitedTerminalStateIsReturned(self):
+    self._MockIssueCommand(_GetResponse('TERMINATED'))
+    data = oci_network._PollUntilState(_GET_CMD, ['TERMINATED'])
+    self.assertEqual(data['lifecycle-state'], 'TERMINATED')
+
+
+class MakeIngressRuleTest(pkb_common_test_case.PkbCommonTestCase):
+
+  @parameterized.named_parameters(
+      (
+          'tcp_port',
+          dict(protocol='6', start_port='22'),
+          None,
+          {'destinationPortRange': {'max': 22, 'min': 22}},
+      ),
+      (
+          'tcp_port_range',
+          dict(protocol='6', start_port=80, end_port='90'),
+          None,
+          {'destinationPortRange': {'max': 90, 'min': 80}},
+      ),
+      ('icmp', dict(protocol='1'), None, None),
+      (
+          'icmp_type_and_code',
+          dict(protocol='1', protocol_type=3, protocol_code=4),
+          {'code': 4, 'type': 3},
+          None,
+      ),
+      (
+          'icmp_type_only',
+          dict(protocol='1', protocol_type=8),
+          {'code': None, 'type': 8},
+          None,
+      ),
+  )
+  def testMakeIngressRule(self, kwargs, icmp_options, tcp_options):
+    self.assertEqual(
+        oci_network._MakeIngressRule(**kwargs),
+        {
+            'source': '0.0.0.0/0',
+            'icmp-options': icmp_options,
+            'protocol': kwargs['protocol'],
+            'is-stateless': False,
+            'tcp-options': tcp_options,
+            'udp-options': None,
+        },
+    )
+
+  def testSourceRange(self):
+    rule = oci_network._MakeIngressRule(source_range='10.0.0.0/8')
+    self.assertEqual(rule['source'], '10.0.0.0/8')
+
+
+class OciNetworkNameTest(pkb_common_test_case.PkbCommonTestCase):
+
+  def setUp(self):
+    super().setUp()
+    FLAGS.oci_use_vcn = False
+    FLAGS.oci_network_name = None
+    self.enter_context(mock.patch.dict(oci_network.OciNetwork._name_suffixes))
+    oci_network.OciNetwork._name_suffixes.clear()
+
+  def _MakeNetwork(self):
+    return oci_network.OciNetwork(mock.Mock(zone='test-profile', cidr=None))
+
+  def testNetworksInARunShareTheName(self):
+    FLAGS.run_uri = 'abc123'
+    name = self._MakeNetwork().name
+    self.assertRegex(name, r'^perfkit-abc123-[0-9a-f]{12}$')
+    self.assertEqual(self._MakeNetwork().name, name)
+    FLAGS.run_uri = 'def456'
+    self.assertRegex(self._MakeNetwork().name, r'^perfkit-def456-')
+
+  def testNetworkNameFlag(self):
+    FLAGS.run_uri = 'abc123'
+    FLAGS.oci_network_name = 'my-network'
+    self.assertEqual(self._MakeNetwork().name, 'my-network')
+    self.assertEqual(oci_network.OciNetwork._name_suffixes, {})
+
+
+class _FakeOciCli:
+  """Answers OCI network CLI calls, reporting canned lifecycle states."""
+
+  def __init__(self, states=None):
+    self.calls = []
+    # Lifecycle state reported for each resource type, AVAILABLE by default.
+    self.states = states or {}
+
+  def IssueCommand(self, cmd, **kwargs):
+    del kwargs
+    self.calls.append(cmd)
+    resource = cmd[cmd.index('network') + 1]
+    data = {
+        'id': resource + '-id',
+        'lifecycle-state': self.states.get(resource, 'AVAILABLE'),
+    }
+    if resource == 'vcn':
+      data.update({
+          'cidr-block': '172.16.0.0/16',
+          'default-route-table-id': 'rt-id',
+          'default-security-list-id': 'sl-id',
+      })
+    elif resource == 'security-list':
+      data['ingress-security-rules'] = []
+    return json.dumps({'data': data}), '', 0
+
+  def IssueCommandBytes(self, cmd, **kwargs):
+    stdout, stderr, retcode = self.IssueCommand(cmd, **kwargs)
+    return stdout.encode(), stderr, retcode
+
+  def Count(self, resource, verb):
+    return sum(
+        1
+        for cmd in self.calls
+        if cmd[cmd.index('network') + 1 : cmd.index('network') + 3]
+        == [resource, verb]
+    )
+
+
+class OciNetworkCliTest(pkb_common_test_case.PkbCommonTestCase):
+
+  def setUp(self):
+    super().setUp()
+    FLAGS.run_uri = 'abc123'
+    FLAGS.oci_use_sdk = False
+    self.enter_context(mock.patch.object(oci_network.time, 'sleep'))
+
+  def _CreateNetwork(self, cli):
+    self.enter_context(
+        mock.patch.object(vm_util, 'IssueCommand', side_effect=cli.IssueCommand)
+    )
+    self.enter_context(
+        mock.patch.object(
+            util, 'IssueCommandBytes', side_effect=cli.IssueCommandBytes
+        )
+    )
+    return oci_network.OciNetwork(mock.Mock(zone='test-profile', cidr=None))
+
+  def testCreate(self):
+    cli = _FakeOciCli()
+    net = self._CreateNetwork(cli)
+    net.Create()
+    self.assertEqual(net.network_id, 'subnet-id')
+    self.assertEqual(cli.Count('vcn', 'create'), 1)
+    # The VCN status poll also supplies the default route table and
+    # security list ids.
+    self.assertEqual(cli.Count('vcn', 'get'), 1)
+    self.assertEqual(cli.Count('security-list', 'update'), 1)
+
+  def testDeleteWaitsForSubnetAndGatewayBeforeVcn(self):
+    cli = _FakeOciCli()
+    net = self._CreateNetwork(cli)
+    net.Create()
+    del cli.calls[:]
+    net.Delete()
+    deletes = [
+        cmd[cmd.index('network') + 1 :] for cmd in cli.calls if 'delete' in cmd
+    ]
+    self.assertCountEqual(
+        [cmd[0] for cmd in deletes[:2]], ['subnet', 'internet-gateway']
+    )
+    for cmd in deletes[:2]:
+      wait_flag = cmd.index('--wait-for-state')
+      self.assertEqual(cmd[wait_flag + 1], 'TERMINATED')
+    self.assertEqual(deletes[2][0], 'vcn')
+
+  def testCreateDoesNotRetryTerminalState(self):
+    cli = _FakeOciCli(states={'subnet': 'FAILED'})
+    net = self._CreateNetwork(cli)
+    with self.assertRaises(errors.Resource.CreationError):
+      net.Create()
+    self.assertEqual(cli.Count('subnet', 'create'), 1)
+
+
+def _SdkResponse(data, headers=None):
+  return oci_network.oci.response.Response(200, headers or {}, data, None)
+
+
+@unittest.skipIf(oci_network.oci is None, 'The oci package is not installed.')
+class OciNetworkSdkTest(pkb_common_test_case.PkbCommonTestCase):
+
+  def setUp(self):
+    super().setUp()
+    FLAGS.run_uri = 'abc123'
+    FLAGS.oci_use_sdk = True
+    FLAGS.oci_compartment_id = 'compartment-id'
+    self.client = mock.Mock()
+    self.wr_client = mock.Mock()
+    self.client_kwargs = {'config': {}}
+    self.get_client_kwargs = self.enter_context(
+        mock.patch.object(
+            oci_network, '_GetSdkClientKwargs', return_value=self.client_kwargs
+        )
+    )
+    self.get_vn_client = self.enter_context(
+        mock.patch.object(
+            oci_network, '_GetVirtualNetworkClient', return_value=self.client
+        )
+    )
+    self.get_wr_client = self.enter_context(
+        mock.patch.object(
+            oci_network, '_GetWorkRequestClient', return_value=self.wr_client
+        )
+    )
+    # Every wait is satisfied by the response it starts from.
+    self.wait_until = self.enter_context(
+        mock.patch.object(
+            oci_network.oci,
+            'wait_until',
+            side_effect=lambda client, response, *args, **kwargs: response,
+        )
+    )
+    models = oci_network.oci.core.models
+    self.client.create_vcn.return_value = _SdkResponse(
+        models.Vcn(id='vcn-id', cidr_block='172.16.0.0/16')
+    )
+    self.client.get_vcn.return_value = _SdkResponse(
+        models.Vcn(
+            id='vcn-id',
+            cidr_block='172.16.0.0/16',
+            default_route_table_id='rt-id',
+            default_security_list_id='sl-id',
+            lifecycle_state='AVAILABLE',
+        )
+    )
+    self.client.create_subnet.return_value = _SdkResponse(
+        models.Subnet(id='subnet-id')
+    )
+    self.client.get_subnet.return_value = _SdkResponse(
+        models.Subnet(id='subnet-id', lifecycle_state='AVAILABLE')
+    )
+    self.client.create_internet_gateway.return_value = _SdkResponse(
+        models.InternetGateway(id='ig-id')
+    )
+    self.client.get_internet_gateway.return_value = _SdkResponse(
+        models.InternetGateway(id='ig-id', lifecycle_state='AVAILABLE')
+    )
+    self.client.get_route_table.return_value = _SdkResponse(
+        models.RouteTable(id='rt-id', lifecycle_state='AVAILABLE')
+    )
+    self.client.get_security_list.return_value = _SdkResponse(
+        models.SecurityList(
+            id='sl-id', lifecycle_state='AVAILABLE', ingress_security_rules=[]
+        )
+    )
+    self.client.update_security_list.return_value = _SdkResponse(
+        models.SecurityList(id='sl-id', lifecycle_state='AVAILABLE')
+    )
+
+  def _CreateNetwork(self):
+    net = oci_network.OciNetwork(mock.Mock(zone='test-profile', cidr=None))
+    net.Create()
+    return net
+
+  def testCreate(self):
+    net = self._CreateNetwork()
+    self.assertEqual(net.network_id, 'subnet-id')
+    # The VCN status wait also supplies the default route table and security
+    # list ids.
+    self.client.get_vcn.assert_called_once_with('vcn-id')
+    vcn_details = self.client.create_vcn.call_args.args[0]
+    self.assertEqual(vcn_details.compartment_id, 'compartment-id')
+    self.assertEqual(vcn_details.cidr_blocks, ['172.16.0.0/16'])
+    subnet_details = self.client.create_subnet.call_args.args[0]
+    self.assertEqual(subnet_details.vcn_id, 'vcn-id')
+    self.assertEqual(subnet_details.cidr_block, '172.16.0.0/16')
+    route_rules = self.client.update_route_table.call_args.args[1].route_rules
+    self.assertEqual([r.network_entity_id for r in route_rules], ['ig-id'])
+    sl_id, sl_details = self.client.update_security_list.call_args.args
+    self.assertEqual(sl_id, 'sl-id')
+    self.assertEqual(
+        [r.protocol for r in sl_details.ingress_security_rules], ['6', '1']
+    )
+
+  def testClientsShareConfig(self):
+    net = oci_network.OciNetwork(mock.Mock(zone='test-profile', cidr=None))
+    self.get_client_kwargs.assert_not_called()
+    self.assertIs(net.vcn._vn_client, self.client)
+    self.assertIs(net.vcn._wr_client, self.wr_client)
+    self.get_client_kwargs.assert_called_once_with('test-profile')
+    self.get_vn_client.assert_called_once_with(self.client_kwargs)
+    self.get_wr_client.assert_called_once_with(self.client_kwargs)
+
+  def testMissingCompartmentIsConfigError(self):
+    FLAGS.oci_compartment_id = None
+    self.enter_context(
+        mock.patch.object(util, 'GetCompartmentId', return_value=None)
+    )
+    with self.assertRaises(errors.Config.MissingOption):
+      oci_network.OciNetwork(mock.Mock(zone='test-profile', cidr=None))
+
+  def testPickle(self):
+    net = self._CreateNetwork()
+    # Like real SDK clients, which hold private keys, the mock clients cannot
+    # be pickled.
+    self.assertIsNotNone(net.vcn._sdk_clients)
+    restored = pickle.loads(pickle.dumps(net))
+    self.assertEqual(restored.vcn.vcn_id, 'vcn-id')
+    self.assertIsNone(restored.vcn._sdk_clients)
+    self.assertIs(restored.vcn._wr_client, self.wr_client)
+
+  def testCreatePassesTagsWithoutOwner(self):
+    self.enter_context(
+        mock.patch.object(
+            util,
+            'GetDefaultTags',
+            return_value={'owner': 'someone', 'benchmark': 'iperf'},
+        )
+    )
+    self._CreateNetwork()
+    vcn_details = self.client.create_vcn.call_args.args[0]
+    self.assertEqual(vcn_details.freeform_tags, {'benchmark': 'iperf'})
+
+  def testCreateWaitsOnWorkRequests(self):
+    for method, resource_id in [
+        (self.client.create_vcn, 'vcn'),
+        (self.client.create_subnet, 'subnet'),
+        (self.client.create_internet_gateway, 'ig'),
+    ]:
+      method.return_value.headers['opc-work-request-id'] = resource_id + '-wr'
+    self.wr_client.get_work_request.return_value = _SdkResponse(
+        oci_network.oci.work_requests.models.WorkRequest(status='SUCCEEDED')
+    )
+    self._CreateNetwork()
+    self.assertCountEqual(
+        [c.args[0] for c in self.wr_client.get_work_request.call_args_list],
+        ['vcn-wr', 'subnet-wr', 'ig-wr'],
+    )
+    self.client.get_subnet.assert_not_called()
+    self.client.get_internet_gateway.assert_not_called()
+    # The VCN details are fetched once, after its work request succeeds.
+    self.client.get_vcn.assert_called_once_with('vcn-id')
+
+  def testCreateRaisesOnFailedWorkRequest(self):
+    self.client.create_vcn.return_value.headers['opc-work-request-id'] = 'wr'
+    self.wr_client.get_work_request.return_value = _SdkResponse(
+        oci_network.oci.work_requests.models.WorkRequest(status='FAILED')
+    )
+    with self.assertRaises(errors.Resource.CreationError):
+      self._CreateNetwork()
+    self.client.create_subnet.assert_not_called()
+
+  def testDeleteWaitsForSubnetAndGatewayBeforeVcn(self):
+    net = self._CreateNetwork()
+    self.client.reset_mock()
+    self.wait_until.reset_mock()
+    net.Delete()
+    names = [name for name, _, _ in self.client.mock_calls]
+    self.assertLess(names.index('get_subnet'), names.index('delete_vcn'))
+    self.assertLess(
+        names.index('get_internet_gateway'), names.index('delete_vcn')
+    )
+    self.assertEqual(self.wait_until.call_count, 2)
+    for call in self.wait_until.call_args_list:
+      self.assertEqual(call.args[2:], ('lifecycle_state', 'TERMINATED'))
+      self.assertTrue(call.kwargs['succeed_on_not_found'])
+
+  def testDeleteWithSubnetAlreadyGone(self):
+    net = self._CreateNetwork()
+    self.client.get_subnet.side_effect = (
+        oci_network.oci.exceptions.ServiceError(
+            404, 'NotAuthorizedOrNotFound', {}, 'Not found'
+        )
+    )
+    net.Delete()
+    self.client.delete_vcn.assert_called_once_with('vcn-id')
+
+
+if __name__ == '__main__':
+  unittest.main()
@@ -0,0 +1,97 @@
+# Copyright (c) 2024, Ampere Computing LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Tests for ampere.pkb.providers.oci.util."""
+
+import subprocess
+import unittest
+
+from absl import flags
+from ampere.pkb.providers.oci import flags as oci_flags  # pylint: disable=unused-import
+from ampere.pkb.providers.oci import util
+import mock
+from perfkitbenchmarker import errors
+from tests import pkb_common_test_case
+
+FLAGS = flags.FLAGS
+
+_CMD = ['oci', 'network', 'vcn', 'get', '--vcn-id', 'vcn-id']
+
+
+class IssueCommandBytesTest(pkb_common_test_case.PkbCommonTestCase):
+
+  def _MockRun(self, **kwargs):
+    return self.enter_context(mock.patch.object(subprocess, 'run', **kwargs))
+
+  def testReturnsStdoutAsBytes(self):
+    run = self._MockRun(
+        return_value=subprocess.CompletedProcess(_CMD, 0, b'{"data": {}}', b'')
+    )
+    stdout, stderr, retcode = util.IssueCommandBytes(_CMD)
+    self.assertEqual(stdout, b'{"data": {}}')
+    self.assertEqual(stderr, '')
+    self.assertEqual(retcode, 0)
+    self.assertEqual(run.call_args.args[0], _CMD)
+
+  def testRaisesOnFailure(self):
+    self._MockRun(
+        return_value=subprocess.CompletedProcess(_CMD, 2, b'', b'NotFound')
+    )
+    with self.assertRaisesRegex(errors.VmUtil.IssueCommandError, 'NotFound'):
+      util.IssueCommandBytes(_CMD)
+
+  def testReturnsFailureWhenNotRaising(self):
+    self._MockRun(
+        return_value=subprocess.CompletedProcess(_CMD, 2, b'', b'NotFound')
+    )
+    self.assertEqual(
+        util.IssueCommandBytes(_CMD, raise_on_failure=False),
+        (b'', 'NotFound', 2),
+    )
+
+  def testRaisesOnTimeout(self):
+    self._MockRun(side_effect=subprocess.TimeoutExpired(_CMD, 5))
+    with self.assertRaises(errors.VmUtil.IssueCommandTimeoutError):
+      util.IssueCommandBytes(_CMD, timeout=5)
+
+
+class GetCompartmentIdTest(pkb_common_test_case.PkbCommonTestCase):
+
+  def setUp(self):
+    super().setUp()
+    cli_rc = self.create_tempfile(
+        content='[test-profile]\ncompartment-id = ocid1.compartment.rc\n'
+    )
+    self.enter_context(
+        mock.patch.object(util, 'OCI_CLI_RC_PATH', cli_rc.full_path)
+    )
+
+  def testFlagOverridesCliRc(self):
+    FLAGS.oci_compartment_id = 'ocid1.compartment.flag'
+    self.assertEqual(
+        util.GetCompartmentId('test-profile'), 'ocid1.compartment.flag'
+    )
+
+  def testFallsBackToCliRc(self):
+    FLAGS.oci_compartment_id = None
+    self.assertEqual(
+        util.GetCompartmentId('test-profile'), 'ocid1.compartment.rc'
+    )
+
+  def testUnknownProfile(self):
+    FLAGS.oci_compartment_id = None
+    self.assertIsNone(util.GetCompartmentId('other-profile'))
+
+
+if __name__ == '__main__':
+  unittest.main()
@@ -7,6 +7,7 @@ from unittest import mock
 
 from absl.testing import flagsaver
 from perfkitbenchmarker import errors
+from perfkitbenchmarker import resource
 from perfkitbenchmarker import sample
 from perfkitbenchmarker.resources import managed_ai_model
 from tests import pkb_common_test_case
@@ -72,6 +73,21 @@ class ManagedAiModelTest(pkb_common_test_case.PkbCommonTestCase):
         ),
     )
 
+  def testGetManagedAiModelClassIsCached(self):
+    managed_ai_model.GetManagedAiModelClass.cache_clear()
+    self.addCleanup(managed_ai_model.GetManagedAiModelClass.cache_clear)
+    get_resource_class = self.enter_context(
+        mock.patch.object(
+            resource, 'GetResourceClass', wraps=resource.GetResourceClass
+        )
+    )
+    for _ in range(3):
+      self.assertIs(
+          managed_ai_model.GetManagedAiModelClass('TEST'),
+          ManagedAiModelImplementation,
+      )
+    get_resource_class.assert_called_once()
+
 
 if __name__ == '__main__':
   unittest.main()